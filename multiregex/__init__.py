@@ -21,6 +21,7 @@ automatically generated prematchers.
 import collections
 import functools
 import importlib.metadata
+import itertools
 import re
 import warnings
 
@@ -32,7 +33,9 @@ except AttributeError:
     import sre_parse
 from typing import (
     Dict,
+    FrozenSet,
     Iterable,
+    Iterator,
     List,
     Optional,
     Pattern,
@@ -57,6 +60,14 @@ PatternOrStr = Union[Pattern, str]
 Prematchers = Set[str]
 FalsePositivesCounter = Dict[str, int]
 
+# Characters that have a special meaning in (non-verbose) regex patterns.
+_SRE_METACHARACTERS = frozenset(".^$*+?{}[]\\|()")
+# Zero-width anchors (prefixes, suffixes) that `_get_literal_prematcher` may strip.
+_LITERAL_PATTERN_ANCHORS = (("^", r"\A", r"\b"), ("$", r"\Z", r"\b"))
+
+# Mask length up to which `_iter_bits` uses arithmetic rather than string search.
+_ITER_BITS_SMALL_MASK_LENGTH = 256
+
 
 class AhocorasickError(Exception):
     pass
@@ -69,6 +80,7 @@ class RegexMatcher:
             Union[PatternOrStr, Tuple[PatternOrStr, Optional[Iterable[str]]]]
         ],
         count_prematcher_false_positives=False,
+        cache_size: int = 0,
     ):
         """
         Parameters
@@ -85,25 +97,77 @@ class RegexMatcher:
             If true, enable "profiling" to check the effectiveness of prematchers on
             the input strings given to ``search``, ``match``, and ``fullmatch``.
             Use ``format_prematcher_false_positives`` to retrieve the profile.
+        cache_size : int, default: 0
+            If positive, cache the pattern candidates of up to this many distinct
+            input strings (least recently used are evicted first). Speeds up
+            workloads that match the same strings over and over again.
+            Note that the cache references the matcher, so a matcher with a cache
+            (and the cached input strings) is only freed by the cyclic garbage
+            collector.
         """
         patterns = self._normalize_patterns(patterns)
         patterns = self._generate_missing_prematchers(patterns)
         self.patterns = [pattern for pattern, _ in patterns]
         self.prematchers = dict(patterns)
         enumerated_patterns = list(enumerate(patterns))
-        self.patterns_without_prematchers = {
-            (idx, pattern)
-            for idx, (pattern, prematchers) in enumerated_patterns
-            if not prematchers
+        # Candidate sets are bitmasks of pattern indices, see `get_pattern_candidates`.
+        self._patterns_without_prematchers_mask = _make_bitmask(
+            idx for idx, (_, prematchers) in enumerated_patterns if not prematchers
+        )
+        self._patterns_without_prematchers_indices = tuple(
+            _iter_bits(self._patterns_without_prematchers_mask)
+        )
+        self.automaton, self._candidate_masks_by_prematcher_id = self._make_automaton(
+            enumerated_patterns
+        )
+        self._min_prematcher_length = min(
+            (
+                len(prematcher)
+                for _, prematchers in patterns
+                for prematcher in prematchers
+            ),
+            default=0,
+        )
+        self._cache_size = cache_size
+        self._enable_cache()
+        # Bound methods are cached per pattern index, saving an attribute lookup
+        # and a bound method allocation per candidate in `run`.
+        search_funcs = tuple(pattern.search for pattern in self.patterns)
+        match_funcs = tuple(pattern.match for pattern in self.patterns)
+        fullmatch_funcs = tuple(pattern.fullmatch for pattern in self.patterns)
+        self._bound_funcs_by_match_func = {
+            re.search: search_funcs,
+            re.match: match_funcs,
+            re.fullmatch: fullmatch_funcs,
+            re.Pattern.search: search_funcs,
+            re.Pattern.match: match_funcs,
+            re.Pattern.fullmatch: fullmatch_funcs,
         }
-        self.automaton = self._make_automaton(enumerated_patterns)
 
         self.count_prematcher_false_positives = count_prematcher_false_positives
         if count_prematcher_false_positives:
-            self.prematcher_false_positives = {
-                pattern: {"positives": 0, "false_positives": 0}
-                for pattern in self.patterns
-            }
+            # Counters are indexed by pattern index, see `prematcher_false_positives`.
+            self._positive_counts = [0] * len(self.patterns)
+            self._false_positive_counts = [0] * len(self.patterns)
+
+    def _enable_cache(self):
+        """Wrap `_get_pattern_candidate_indices` in an LRU cache if configured."""
+        if self._cache_size > 0:
+            # Per-instance cache, so that cached candidates never leak across matchers.
+            self._get_pattern_candidate_indices = functools.lru_cache(  # type: ignore
+                self._cache_size
+            )(self._get_pattern_candidate_indices)
+
+    # The cache wrapper is bound to `self`, so it can't be pickled (or copied) as is.
+    # Drop it and create a fresh one for the new instance instead.
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop("_get_pattern_candidate_indices", None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._enable_cache()
 
     @classmethod
     def generate_prematchers(cls, pattern: Pattern) -> Prematchers:
@@ -122,13 +186,20 @@ class RegexMatcher:
             else:
                 return set(iterable)
 
-        patterns = list(patterns)
-        if patterns and not isinstance(patterns[0], tuple):
-            return [(re.compile(pattern), None) for pattern in patterns]
+        # Peek at the first item to tell plain patterns from tuples, without
+        # materializing `patterns` into an intermediate list.
+        patterns = iter(patterns)
+        try:
+            first = next(patterns)
+        except StopIteration:
+            return []
+        patterns = itertools.chain([first], patterns)
+        if not isinstance(first, tuple):
+            return [(_compile_pattern(pattern), None) for pattern in patterns]
         else:
             return [
                 (
-                    re.compile(pattern),
+                    _compile_pattern(pattern),
                     None if prematchers is None else safe_set(prematchers),
                 )
                 for pattern, prematchers in patterns
@@ -153,15 +224,29 @@ class RegexMatcher:
 
     @staticmethod
     def _make_automaton(enumerated_patterns):
-        """Create the pyahocorasick automaton."""
-        pattern_candidates_by_prematchers = collections.defaultdict(set)
-        for pattern_idx, (pattern, prematchers) in enumerated_patterns:
+        """Create the pyahocorasick automaton.
+
+        The automaton maps each prematcher to a prematcher ID, which is an index
+        into the returned list of pattern candidate bitmasks. If there are no
+        prematchers at all, the automaton is None.
+        """
+        candidate_mask_by_prematchers: Dict[str, int] = collections.defaultdict(int)
+        for pattern_idx, (_, prematchers) in enumerated_patterns:
             for prematcher in prematchers:
-                # `pattern_idx` is used for keeping patterns in order, see `get_pattern_candidates`.
-                pattern_candidates_by_prematchers[prematcher].add(
-                    (pattern_idx, pattern)
+                # Bit `pattern_idx` is set for each candidate pattern, see `get_pattern_candidates`.
+                candidate_mask_by_prematchers[prematcher] |= 1 << pattern_idx
+        if not candidate_mask_by_prematchers:
+            # pyahocorasick refuses to make an automaton without words.
+            return None, []
+        automaton = _ahocorasick_make_automaton(
+            {
+                prematcher: prematcher_id
+                for prematcher_id, prematcher in enumerate(
+                    candidate_mask_by_prematchers
                 )
-        return _ahocorasick_make_automaton(pattern_candidates_by_prematchers)
+            }
+        )
+        return automaton, list(candidate_mask_by_prematchers.values())
 
     def run(self, match_func, s, enable_prematchers=True):
         """Quickly run `match_func` against `s` for all patterns.
@@ -175,48 +260,230 @@ class RegexMatcher:
         enable_prematchers : bool (default True)
             If false, do not use prematchers; use `match_func` only.
         """
+        patterns = self.patterns
         if enable_prematchers:
-            candidates = self.get_pattern_candidates(s)
+            candidate_indices = self._get_pattern_candidate_indices(s)
+            if not candidate_indices:
+                return []
         else:
-            candidates = self.patterns
-
-        # Inlined versions for match_func = re.match/search, up to 30% faster.
-        if match_func is re.search:
-            re_results = [(pattern, pattern.search(s)) for pattern in candidates]
-        elif match_func is re.match:
-            re_results = [(pattern, pattern.match(s)) for pattern in candidates]
-        elif match_func is re.fullmatch:
-            re_results = [(pattern, pattern.fullmatch(s)) for pattern in candidates]
+            candidate_indices = range(len(patterns))
+
+        # Inlined versions for match_func = re.match/search/fullmatch (or the
+        # corresponding `re.Pattern` methods), up to 30% faster.
+        funcs = self._get_bound_funcs(match_func)
+
+        if self.count_prematcher_false_positives:
+            if funcs is None:
+                matches = [match_func(patterns[idx], s) for idx in candidate_indices]
+            else:
+                matches = [funcs[idx](s) for idx in candidate_indices]
+            positive_counts = self._positive_counts
+            false_positive_counts = self._false_positive_counts
+            for idx, match in zip(candidate_indices, matches):
+                positive_counts[idx] += 1
+                if match is None:
+                    false_positive_counts[idx] += 1
+            return [
+                (patterns[idx], match)
+                for idx, match in zip(candidate_indices, matches)
+                if match is not None
+            ]
+
+        # Single pass without intermediate list of all results.
+        if funcs is None:
+            return [
+                (patterns[idx], match)
+                for idx in candidate_indices
+                if (match := match_func(patterns[idx], s)) is not None
+            ]
         else:
-            re_results = [(pattern, match_func(pattern, s)) for pattern in candidates]
+            return [
+                (patterns[idx], match)
+                for idx in candidate_indices
+                if (match := funcs[idx](s)) is not None
+            ]
+
+    def _get_bound_funcs(self, match_func):
+        """Get the bound `match_func` methods of all patterns, or None if unknown."""
+        try:
+            return self._bound_funcs_by_match_func.get(match_func)
+        except TypeError:
+            # Unhashable callable, can't be one of the inlined functions.
+            return None
+
+    # Explicit methods rather than `functools.partialmethod`, which adds call overhead.
+    def search(self, s, enable_prematchers=True):
+        """Alias for ``run(re.search, ...)``."""
+        return self.run(re.search, s, enable_prematchers)
+
+    def match(self, s, enable_prematchers=True):
+        """Alias for ``run(re.match, ...)``."""
+        return self.run(re.match, s, enable_prematchers)
+
+    def fullmatch(self, s, enable_prematchers=True):
+        """Alias for ``run(re.fullmatch, ...)``."""
+        return self.run(re.fullmatch, s, enable_prematchers)
+
+    def run_many(self, match_func, strings, enable_prematchers=True):
+        """Run `match_func` against each of `strings` for all patterns.
+
+        Equivalent to ``[run(match_func, s, enable_prematchers) for s in strings]``.
+
+        Parameters
+        ----------
+        match_func : Callable[str] -> Match
+            The base matching function, eg. `re.search`.
+        strings : iterable of str
+            The strings to match against.
+        enable_prematchers : bool (default True)
+            If false, do not use prematchers; use `match_func` only.
+        """
+        run = self.run
+        return [run(match_func, s, enable_prematchers) for s in strings]
+
+    def search_many(self, strings, enable_prematchers=True):
+        """Alias for ``run_many(re.search, ...)``."""
+        return self.run_many(re.search, strings, enable_prematchers)
+
+    def match_many(self, strings, enable_prematchers=True):
+        """Alias for ``run_many(re.match, ...)``."""
+        return self.run_many(re.match, strings, enable_prematchers)
+
+    def fullmatch_many(self, strings, enable_prematchers=True):
+        """Alias for ``run_many(re.fullmatch, ...)``."""
+        return self.run_many(re.fullmatch, strings, enable_prematchers)
+
+    def run_any(self, match_func, s, enable_prematchers=True) -> bool:
+        """Check if `match_func` matches `s` for any of the patterns.
+
+        Same as ``bool(run(match_func, s, enable_prematchers))``, but stops at the
+        first matching pattern.
+
+        When profiling with ``count_prematcher_false_positives``, only the candidates
+        evaluated up to the first match are counted, so false positive rates are
+        skewed towards patterns that come first.
+        """
+        patterns = self.patterns
+        if enable_prematchers:
+            candidate_indices = self._get_pattern_candidate_indices(s)
+        else:
+            candidate_indices = range(len(patterns))
+
+        funcs = self._get_bound_funcs(match_func)
+        if funcs is None:
+            matches = (match_func(patterns[idx], s) for idx in candidate_indices)
+        else:
+            matches = (funcs[idx](s) for idx in candidate_indices)
 
         if self.count_prematcher_false_positives:
-            for pattern, match in re_results:
-                self.prematcher_false_positives[pattern]["positives"] += 1
+            for idx, match in zip(candidate_indices, matches):
+                self._positive_counts[idx] += 1
                 if match is None:
-                    self.prematcher_false_positives[pattern]["false_positives"] += 1
+                    self._false_positive_counts[idx] += 1
+                else:
+                    return True
+            return False
+        else:
+            return any(match is not None for match in matches)
+
+    def search_any(self, s, enable_prematchers=True):
+        """Alias for ``run_any(re.search, ...)``."""
+        return self.run_any(re.search, s, enable_prematchers)
 
-        return [(pattern, match) for pattern, match in re_results if match is not None]
+    def match_any(self, s, enable_prematchers=True):
+        """Alias for ``run_any(re.match, ...)``."""
+        return self.run_any(re.match, s, enable_prematchers)
 
-    """Alias for ``run(re.search, ...)``."""
-    search = functools.partialmethod(run, re.search)
-    """Alias for ``run(re.match, ...)``."""
-    match = functools.partialmethod(run, re.match)
-    """Alias for ``run(re.fullmatch, ...)``."""
-    fullmatch = functools.partialmethod(run, re.fullmatch)
+    def fullmatch_any(self, s, enable_prematchers=True):
+        """Alias for ``run_any(re.fullmatch, ...)``."""
+        return self.run_any(re.fullmatch, s, enable_prematchers)
 
     def get_pattern_candidates(self, s: str) -> List[Pattern]:
         """Get a list of patterns that potentially match `s`.
 
         Pattern order is the same the order of `patterns` given to `__init__`.
         """
-        matches = self.automaton.iter(s.lower())
-        unordered_candidates = self.patterns_without_prematchers.union(
-            *(candidates for _, candidates in matches)
-        )
-        # Sort by `pattern_idx`, see `_make_automaton`.
-        ordered_candidates = sorted(unordered_candidates, key=lambda x: x[0])
-        return [pattern for _, pattern in ordered_candidates]
+        return [self.patterns[idx] for idx in self._get_pattern_candidate_indices(s)]
+
+    def get_pattern_candidate_indices(self, s: str) -> List[int]:
+        """Like `get_pattern_candidates`, but return indices into `patterns`.
+
+        Indices are in ascending order.
+        """
+        return list(self._get_pattern_candidate_indices(s))
+
+    def _get_pattern_candidate_indices(self, s: str) -> Tuple[int, ...]:
+        """Get the candidate indices for `s`, see `get_pattern_candidate_indices`.
+
+        May be wrapped in an LRU cache (see `cache_size`), hence returns a tuple.
+        """
+        if self.automaton is None:
+            return self._patterns_without_prematchers_indices
+        # Skip the automaton if `s` is too short for any prematcher to occur in.
+        # Lowercasing keeps the length of ASCII strings, so those can be checked
+        # without lowercasing them first. Prematchers may contain non-ASCII
+        # characters, so an ASCII-only lowercasing table won't do. `str.lower` has
+        # a fast path for ASCII strings anyway.
+        if s.isascii():
+            if len(s) < self._min_prematcher_length:
+                return self._patterns_without_prematchers_indices
+            s_lower = s.lower()
+        else:
+            s_lower = s.lower()
+            if len(s_lower) < self._min_prematcher_length:
+                return self._patterns_without_prematchers_indices
+        # Each prematcher contributes its candidates only once, no matter how
+        # often it occurs in `s`.
+        prematcher_ids = {
+            prematcher_id for _, prematcher_id in self.automaton.iter(s_lower)
+        }
+        # Most strings don't contain any prematcher; skip decoding the bitmask.
+        if not prematcher_ids:
+            return self._patterns_without_prematchers_indices
+        candidate_masks = self._candidate_masks_by_prematcher_id
+        candidates_mask = self._patterns_without_prematchers_mask
+        for prematcher_id in prematcher_ids:
+            candidates_mask |= candidate_masks[prematcher_id]
+        # Bits are yielded in ascending order, so no sorting is required.
+        return tuple(_iter_bits(candidates_mask))
+
+    @property
+    def patterns_without_prematchers(self) -> Set[Tuple[int, Pattern]]:
+        """Get the patterns with prematching disabled as set of ``(idx, pattern)``."""
+        return {
+            (idx, self.patterns[idx])
+            for idx in self._patterns_without_prematchers_indices
+        }
+
+    @property
+    def prematcher_false_positives(self) -> Dict[Pattern, FalsePositivesCounter]:
+        """Get the prematcher profile as ``{pattern: fp_counter}`` dict.
+
+        The dict is a snapshot built from the internal per-pattern counters on each
+        access; modifying it doesn't affect the profile. Use
+        ``reset_prematcher_false_positives`` to reset the profile.
+
+        Raises `AttributeError` if profiling is not enabled.
+        """
+        if not self.count_prematcher_false_positives:
+            # AttributeError rather than RuntimeError, so that `hasattr` works.
+            raise AttributeError("Prematcher profiling not enabled")
+        fp_counters = {
+            pattern: {"positives": 0, "false_positives": 0} for pattern in self.patterns
+        }
+        for pattern, positive_count, false_positive_count in zip(
+            self.patterns, self._positive_counts, self._false_positive_counts
+        ):
+            fp_counters[pattern]["positives"] += positive_count
+            fp_counters[pattern]["false_positives"] += false_positive_count
+        return fp_counters
+
+    def reset_prematcher_false_positives(self) -> None:
+        """Reset the prematcher profile to zero."""
+        if not self.count_prematcher_false_positives:
+            raise RuntimeError("Prematcher profiling not enabled")
+        self._positive_counts = [0] * len(self.patterns)
+        self._false_positive_counts = [0] * len(self.patterns)
 
     def get_prematcher_false_positives(
         self,
@@ -253,11 +520,23 @@ class RegexMatcher:
         return "\n".join(output)
 
 
+def _compile_pattern(pattern: PatternOrStr) -> Pattern:
+    """Like `re.compile`, but return `re.Pattern` instances as-is.
+
+    `re.compile` does the same, but only after hashing the pattern for a lookup
+    in its compile cache.
+    """
+    return pattern if isinstance(pattern, re.Pattern) else re.compile(pattern)
+
+
 def validate_prematcher(prematcher: str) -> None:
-    if not prematcher or any(map(str.isupper, prematcher)):
-        raise ValueError(
-            f"Prematcher {prematcher!r} must be non-empty, all-lowercase, all-ASCII"
-        )
+    if prematcher.isascii():
+        # For ASCII strings, `str.lower` only changes uppercase characters.
+        is_valid = bool(prematcher) and prematcher.lower() == prematcher
+    else:
+        is_valid = not any(map(str.isupper, prematcher))
+    if not is_valid:
+        raise ValueError(f"Prematcher {prematcher!r} must be non-empty, all-lowercase")
 
 
 def generate_prematchers(pattern: Pattern) -> Prematchers:
@@ -268,16 +547,31 @@ def generate_prematchers(pattern: Pattern) -> Prematchers:
     -> {" regex"}. One level of branches with the "|" character is
     supported, ie. "(a|bb|ccc)" -> {"ccc", "a", "bb"}.
     """
+    return set(_generate_prematchers_cached(pattern.pattern))
+
+
+@functools.lru_cache(maxsize=4096)
+def _generate_prematchers_cached(pattern_str: str) -> FrozenSet[str]:
+    """Cached implementation of `generate_prematchers`.
+
+    Prematchers only depend on the pattern string, so they can be shared between
+    patterns (and `RegexMatcher` instances) with the same pattern string.
+    """
 
     def _get_top_level_prematcher(sre_ast):
         return max(_sre_find_terminals(sre_ast), key=len, default="").lower()
 
-    sre_ast = _simplify_sre_ast(sre_parse.parse(pattern.pattern))
+    # Fast path: Literal patterns don't need to be parsed (eg. r"\bfoo\b" -> "foo").
+    literal_prematcher = _get_literal_prematcher(pattern_str)
+    if literal_prematcher:
+        return frozenset({literal_prematcher})
+
+    sre_ast = _simplify_sre_ast(sre_parse.parse(pattern_str))
 
     # Simple case: We find a top-level terminal string (eg. r"Fast(er)" -> "Fast").
     top_level_prematcher = _get_top_level_prematcher(sre_ast)
     if top_level_prematcher:
-        return {top_level_prematcher}
+        return frozenset({top_level_prematcher})
 
     # Branch case: We find a first-level terminal string in a branch (eg. r"(abc|de)" -> {"abc", "de"}).
     # Each of the children must have a top-level simple prematcher. Nesting is not supported.
@@ -286,11 +580,35 @@ def generate_prematchers(pattern: Pattern) -> Prematchers:
     )
     for children in sre_branches:
         simplified_children = map(_simplify_sre_ast, children)
-        child_prematchers = set(map(_get_top_level_prematcher, simplified_children))
+        child_prematchers = frozenset(
+            map(_get_top_level_prematcher, simplified_children)
+        )
         if all(child_prematchers):
             return child_prematchers
 
-    raise ValueError(f"Could not generate prematchers for {pattern.pattern!r}")
+    raise ValueError(f"Could not generate prematchers for {pattern_str!r}")
+
+
+def _get_literal_prematcher(pattern_str: str) -> Optional[str]:
+    """Get the prematcher for a pattern that is a literal string, optionally
+    anchored by any of `_LITERAL_PATTERN_ANCHORS`.
+
+    Returns None for all other patterns. The result is the same as the
+    result of the sre AST based code path in `generate_prematchers`.
+    """
+    prefixes, suffixes = _LITERAL_PATTERN_ANCHORS
+    for prefix in prefixes:
+        if pattern_str.startswith(prefix):
+            pattern_str = pattern_str[len(prefix) :]
+            break
+    for suffix in suffixes:
+        if pattern_str.endswith(suffix):
+            pattern_str = pattern_str[: -len(suffix)]
+            break
+    if _SRE_METACHARACTERS.isdisjoint(pattern_str):
+        return pattern_str.lower()
+    else:
+        return None
 
 
 def _simplify_sre_ast(sre_ast):
@@ -311,21 +629,50 @@ def _simplify_sre_ast(sre_ast):
 
 def _sre_find_terminals(sre_ast):
     """Find all terminals (streaks of LITERALs) in an sre AST."""
-    i = 0
-    while i < len(sre_ast):
-        chars = []
-        while i < len(sre_ast) and sre_ast[i][0] is sre_constants.LITERAL:
-            chars.append(cast(int, sre_ast[i][1]))
-            i += 1
+    chars: List[int] = []
+    for type_, value in sre_ast:
+        if type_ is sre_constants.LITERAL:
+            chars.append(cast(int, value))
+        elif chars:
+            yield "".join(map(chr, chars))
+            chars = []
+    if chars:
         yield "".join(map(chr, chars))
-        i += 1
+
+
+def _make_bitmask(indices: Iterable[int]) -> int:
+    """Make a bitmask with bits `indices` set."""
+    mask = 0
+    for idx in indices:
+        mask |= 1 << idx
+    return mask
+
+
+def _iter_bits(mask: int) -> Iterator[int]:
+    """Iterate the indices of the set bits in `mask`, in ascending order."""
+    if mask.bit_length() <= _ITER_BITS_SMALL_MASK_LENGTH:
+        while mask:
+            lowest_bit = mask & -mask
+            yield lowest_bit.bit_length() - 1
+            mask ^= lowest_bit
+    else:
+        # Each `mask & -mask` step above allocates a new int of the size of `mask`,
+        # which is quadratic for large and dense masks. For large masks, find the
+        # bits in the (reversed) binary string representation instead.
+        bits = bin(mask)[:1:-1]
+        idx = bits.find("1")
+        while idx != -1:
+            yield idx
+            idx = bits.find("1", idx + 1)
 
 
 def _ahocorasick_make_automaton(words: Dict[str, V]) -> "ahocorasick.Automaton[V]":
     """Make an ahocorasick automaton from a dictionary of `needle -> value`
     items."""
     automaton = ahocorasick.Automaton()  # type: ahocorasick.Automaton[V]
-    for word, value in words.items():
+    # Adding words shortest first makes trie nodes be allocated roughly in
+    # breadth-first order, which improves memory locality during `iter`.
+    for word, value in sorted(words.items(), key=lambda item: (len(item[0]), item[0])):
         _ahocorasick_ensure_successful(automaton.add_word(word, value))
     _ahocorasick_ensure_successful(automaton.make_automaton())
     return automaton
@@ -1,3 +1,6 @@
+import copy
+import dataclasses
+import pickle
 import random
 import re
 
@@ -22,9 +25,24 @@ def test_basics():
     )
 
 
+def test_patterns_iterator():
+    assert RegexMatcher(iter(["a"])).search("a")
+    assert RegexMatcher(iter([("a", None)])).search("a")
+
+
+def test_without_prematchers():
+    assert not RegexMatcher([]).search("a")
+    matcher = RegexMatcher([("a", []), ("b", [])])
+    assert matcher.get_pattern_candidate_indices("x") == [0, 1]
+    assert [p.pattern for p, _ in matcher.search("b")] == ["b"]
+
+
 def test_unicode():
     matcher = RegexMatcher(["ä"])
     assert matcher.search("ä")
+    # "İ".lower() is two characters long.
+    matcher = RegexMatcher(["İ"])
+    assert matcher.search("İ")
 
 
 def test_search_match_fullmatch():
@@ -35,6 +53,43 @@ def test_search_match_fullmatch():
     assert matcher.match("b")
     assert not matcher.fullmatch("bb")
     assert matcher.fullmatch("b")
+    assert matcher.run(re.Pattern.search, "abc")
+    assert not matcher.run(re.Pattern.match, "abc")
+    assert matcher.run(lambda pattern, s: pattern.search(s), "abc")
+
+    @dataclasses.dataclass
+    class UnhashableSearch:
+        def __call__(self, pattern, s):
+            return pattern.search(s)
+
+    assert matcher.run(UnhashableSearch(), "abc")
+    assert matcher.run_many(UnhashableSearch(), ["abc"])[0]
+    assert matcher.run_any(UnhashableSearch(), "abc")
+
+
+def test_search_match_fullmatch_many():
+    matcher = RegexMatcher(["b"])
+    strings = ["abc", "b", "bb", "x"]
+    for method, many_method in [
+        (matcher.search, matcher.search_many),
+        (matcher.match, matcher.match_many),
+        (matcher.fullmatch, matcher.fullmatch_many),
+    ]:
+        results = many_method(iter(strings))
+        assert len(results) == len(strings)
+        for s, result in zip(strings, results):
+            assert_matches_equal(result, method(s))
+
+
+def test_search_match_fullmatch_any():
+    matcher = RegexMatcher([("b", None), ("c+", [])])
+    for s in ["abc", "b", "bb", "cc", "x"]:
+        assert matcher.search_any(s) == bool(matcher.search(s))
+        assert matcher.match_any(s) == bool(matcher.match(s))
+        assert matcher.fullmatch_any(s) == bool(matcher.fullmatch(s))
+        assert matcher.run_any(re.search, s, enable_prematchers=False) == bool(
+            matcher.search(s)
+        )
 
 
 def test_ordered():
@@ -47,10 +102,68 @@ def test_ordered():
     assert [p for p, _ in matches] == [p for p, _ in patterns]
 
 
+def test_overlapping_prematchers():
+    # Overlapping prematcher occurrences must all be found, eg. "ab" and "bc" in "abc".
+    matcher = RegexMatcher(["ab", "bc", "b", "abc"])
+    assert matcher.get_pattern_candidate_indices("abc") == [0, 1, 2, 3]
+
+
+def test_get_pattern_candidate_indices():
+    matcher = RegexMatcher([("a", None), ("b", []), ("c", None)])
+    assert matcher.get_pattern_candidate_indices("xcx") == [1, 2]
+    assert matcher.get_pattern_candidate_indices("") == [1]
+    long_matcher = RegexMatcher([("abc", None), ("b", [])])
+    assert long_matcher.get_pattern_candidate_indices("ab") == [1]
+    assert long_matcher.get_pattern_candidate_indices("abc") == [0, 1]
+    assert matcher.get_pattern_candidates("xcx") == matcher.patterns[1:]
+    assert matcher.patterns_without_prematchers == {(1, matcher.patterns[1])}
+
+
+def test_cache_size():
+    matcher = RegexMatcher(["a", "b"], cache_size=1)
+    assert matcher.get_pattern_candidate_indices("a") == [0]
+    assert_matches_equal(matcher.search("a"), [(matcher.patterns[0], "a")])
+    assert matcher.get_pattern_candidate_indices("b") == [1]
+    cache_info = matcher._get_pattern_candidate_indices.cache_info()  # type: ignore
+    assert (cache_info.hits, cache_info.misses) == (1, 2)
+
+
+@pytest.mark.parametrize("cache_size", [0, 1])
+@pytest.mark.parametrize(
+    "copy_func", [copy.copy, copy.deepcopy, lambda m: pickle.loads(pickle.dumps(m))]
+)
+def test_copy(cache_size, copy_func):
+    matcher = RegexMatcher(["a", "b"], cache_size=cache_size)
+    matcher_copy = copy_func(matcher)
+    assert [p.pattern for p, _ in matcher_copy.search("ab")] == ["a", "b"]
+    if cache_size:
+        # The copy must have its own cache.
+        for m, expected_misses in [(matcher, 0), (matcher_copy, 1)]:
+            cache_info = m._get_pattern_candidate_indices.cache_info()  # type: ignore
+            assert cache_info.misses == expected_misses
+
+
+@pytest.mark.parametrize("n_patterns", [10, 1000])
+def test_many_patterns(n_patterns):
+    matcher = RegexMatcher(
+        [(f"x{i}y", None if i % 3 else []) for i in range(n_patterns)]
+    )
+    expected = [i for i in range(n_patterns) if i % 3 == 0 or i == 5]
+    assert matcher.get_pattern_candidate_indices("x5y") == expected
+    assert [p.pattern for p, _ in matcher.search("x5y")] == ["x5y"]
+
+
 @pytest.mark.parametrize(
     "pattern, prematcher",
     [
         ("a", {"a"}),
+        ("Foo Bar", {"foo bar"}),
+        (r"\bfoo\b", {"foo"}),
+        (r"^Gemäß$", {"gemäß"}),
+        (r"\Afoo\Z", {"foo"}),
+        (r"foo\\b", {"foo\\b"}),
+        (r"\b", None),
+        ("", None),
         ("[a]", {"a"}),
         ("a[0-9]b", {"a"}),
         ("a[0-9]+b", {"a"}),
@@ -73,11 +186,19 @@ def test_generate_prematchers(pattern, prematcher):
         assert prematcher is None
 
 
+def test_generate_prematchers_returns_copy():
+    prematchers = generate_prematchers(re.compile("abc"))
+    prematchers.add("x")
+    assert generate_prematchers(re.compile("abc")) == {"abc"}
+
+
 @pytest.mark.parametrize(
     "prematchers",
     [
         [""],
         ["UPPER"],
+        ["Ä"],
+        ["upPer"],
         "abc",
     ],
 )
@@ -96,3 +217,23 @@ def test_false_positives_counter():
     assert "0.67" in matcher.format_prematcher_false_positives()
     # aa -> {"aa"} doesn't prematch "a".
     assert "0.50" in matcher.format_prematcher_false_positives()
+    assert matcher.match_any("aa")
+    assert list(matcher.prematcher_false_positives.values()) == [
+        {"positives": 4, "false_positives": 2},
+        {"positives": 2, "false_positives": 1},
+    ]
+    matcher.reset_prematcher_false_positives()
+    assert "(No data)" in matcher.format_prematcher_false_positives()
+    assert list(matcher.prematcher_false_positives.values()) == [
+        {"positives": 0, "false_positives": 0},
+        {"positives": 0, "false_positives": 0},
+    ]
+
+
+def test_false_positives_counter_disabled():
+    matcher = RegexMatcher(["a"])
+    with pytest.raises(RuntimeError):
+        matcher.get_prematcher_false_positives()
+    with pytest.raises(RuntimeError):
+        matcher.reset_prematcher_false_positives()
+    assert not hasattr(matcher, "prematcher_false_positives")